@@ -1,6 +1,7 @@
 import streamlit as st
-import requests
+import httpx
 import json
+import time
 from datetime import datetime
 
 # Configure page
@@ -28,9 +29,33 @@ st.markdown("""
 # Constants
 API_ENDPOINT = "https://d9lskv83ek.execute-api.us-east-1.amazonaws.com/dev/agentbedrock"
 
+# Not 504: the Lambda behind a gateway timeout is still generating, and
+# retrying the POST would start another full generation alongside it
+RETRY_STATUSES = {429, 500, 502, 503}
+MAX_RETRIES = 3
+
+# HTTP/2 client (cached so reruns share one multiplexed keep-alive connection)
+@st.cache_resource
+def get_http_client() -> httpx.Client:
+    return httpx.Client(
+        timeout=30,
+        headers={"Content-Type": "application/json"},
+        transport=httpx.HTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60),
+            retries=MAX_RETRIES  # Retries failed connects; status retries are in fetch_blog
+        )
+    )
+
+CLIENT = get_http_client()
+
 # Session state
 if 'generated_content' not in st.session_state:
     st.session_state.generated_content = None
+if 'generated_at' not in st.session_state:
+    st.session_state.generated_at = None
+if 'generated_url' not in st.session_state:
+    st.session_state.generated_url = None
 
 # --- UI Components ---
 def show_header():
@@ -63,57 +88,46 @@ def input_section():
     return topic.strip(), expertise, context.strip()
 
 # --- Core Functions ---
-def call_lambda_backend(topic: str, expertise: str, context: str):
-    """Call the AWS Lambda endpoint"""
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_blog(topic: str, expertise: str, context: str) -> dict:
+    """POST to the AWS Lambda endpoint; raises so failures are never cached"""
     payload = {
         "blogTopic": topic,
         "level": expertise,
         "context": context
     }
     
-    try:
-        response = requests.post(
-            API_ENDPOINT,
-            json=payload,
-            headers={"Content-Type": "application/json"},
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            content = response.json()
-            if "blog" in content:
-                return content["blog"]
-            return None
-        else:
-            st.error(f"API returned status code: {response.status_code}")
-            return None
+    for attempt in range(MAX_RETRIES + 1):
+        response = CLIENT.post(API_ENDPOINT, json=payload)
+        if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            break
+        time.sleep(0.3 * 2 ** attempt)
+    response.raise_for_status()
     
-    except requests.exceptions.RequestException as e:
-        st.error(f"Error connecting to API: {str(e)}")
-        return None
+    content = response.json()
+    if not content.get("success") or not content.get("blog"):
+        raise ValueError("No blog content returned")
+    return {"blog": content["blog"], "url": content.get("url")}
 
-# --- Main App Flow ---
-def main():
-    show_header()
-    
-    topic, expertise, context = input_section()
+def call_lambda_backend(topic: str, expertise: str, context: str):
+    """Call the AWS Lambda endpoint, reusing cached results for repeat inputs"""
+    try:
+        return fetch_blog(topic, expertise, context)
     
-    col1, col2 = st.columns([1, 4])
-    with col1:
-        if st.button("🚀 Generate Content", use_container_width=True):
-            with st.spinner("Generating content..."):
-                content = call_lambda_backend(topic, expertise, context)
-                
-                if content:
-                    st.session_state.generated_content = content
-                    st.success("Content generated successfully!")
-                else:
-                    st.error("Failed to generate content. Please try again.")
+    except httpx.HTTPStatusError as e:
+        st.error(f"API returned status code: {e.response.status_code}")
+        return None
     
-    with col2:
-        if st.button("🔄 Clear", use_container_width=True):
-            st.session_state.generated_content = None
+    except httpx.HTTPError as e:
+        st.error(f"Error connecting to API: {str(e)}")
+        return None
     
+    except ValueError:
+        return None
+
+@st.fragment
+def results_section():
+    """Render the generated blog; the download button only reruns this fragment"""
     if st.session_state.generated_content:
         blog = st.session_state.generated_content
         
@@ -123,9 +137,45 @@ def main():
         st.download_button(
             label="📥 Download Content",
             data=blog,
-            file_name=f"content_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
+            file_name=f"content_{st.session_state.generated_at}.txt",
             mime="text/plain"
         )
+        
+        if st.session_state.generated_url:
+            st.link_button("🔗 Open in S3", st.session_state.generated_url)
+
+# --- Main App Flow ---
+def main():
+    show_header()
+    
+    # Inside a form, editing the inputs doesn't rerun the app until a button is pressed
+    with st.form("content_form", border=False):
+        topic, expertise, context = input_section()
+        
+        col1, col2 = st.columns([1, 4])
+        with col1:
+            generate = st.form_submit_button("🚀 Generate Content", use_container_width=True)
+        with col2:
+            clear = st.form_submit_button("🔄 Clear", use_container_width=True)
+    
+    if generate:
+        with st.spinner("Generating content..."):
+            content = call_lambda_backend(topic, expertise, context)
+            
+            if content:
+                st.session_state.generated_content = content["blog"]
+                st.session_state.generated_url = content["url"]
+                st.session_state.generated_at = datetime.now().strftime('%Y%m%d_%H%M%S')
+                st.success("Content generated successfully!")
+            else:
+                st.error("Failed to generate content. Please try again.")
+    
+    if clear:
+        st.session_state.generated_content = None
+        st.session_state.generated_at = None
+        st.session_state.generated_url = None
+    
+    results_section()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
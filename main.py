@@ -1,99 +1,363 @@
+import base64
+import binascii
+import hashlib
 import json
+import os
+import re
+import time
 import boto3
 import botocore.config
-from datetime import datetime
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
-# Initialize logger
+# orjson (C extension) when bundled with the function, stdlib json otherwise.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either.
+try:
+    import orjson
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    json_loads = json.loads
+
+# Initialize logger (prompts and bodies are only logged at DEBUG)
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+try:
+    logger.setLevel((os.environ.get("LOG_LEVEL") or "WARNING").upper())
+except ValueError:
+    # An unknown level must not crash INIT
+    logger.setLevel(logging.WARNING)
+    logger.warning(f"Unknown LOG_LEVEL {os.environ['LOG_LEVEL']!r}, using WARNING")
 
-def content_generation(blogtopic: str, expertise_level: str, additional_context: str) -> dict:
-    """
-    Generate blog content using AWS Bedrock.
-    Returns: Plain text blog content.
-    """
-    full_prompt = f"""You are a helpful AI assistant. Follow these instructions exactly:
+# AWS clients are created once per container and reused across warm invocations
+BEDROCK = boto3.client(
+    service_name="bedrock-runtime",
+    region_name="us-east-1",
+    config=botocore.config.Config(
+        read_timeout=300,
+        retries={'max_attempts': 3},
+        tcp_keepalive=True
+    )
+)
+# S3 calls sit on the response path, so they give up quickly: an upload
+# takes at most S3_ATTEMPTS * (connect + read timeout)
+S3_TIMEOUT_SECONDS = 1
+S3_ATTEMPTS = 2
+UPLOAD_BUDGET_SECONDS = S3_ATTEMPTS * 2 * S3_TIMEOUT_SECONDS
+S3 = boto3.client(
+    's3',
+    config=botocore.config.Config(
+        connect_timeout=S3_TIMEOUT_SECONDS,
+        read_timeout=S3_TIMEOUT_SECONDS,
+        retries={'max_attempts': S3_ATTEMPTS},
+        tcp_keepalive=True
+    )
+)
+DDB = boto3.client('dynamodb', region_name="us-east-1")
+
+MODEL_ID = "us.meta.llama3-3-70b-instruct-v1:0"
+FAILED_BLOG = "Failed to generate content. Please try again."  # Returned with success: False
+
+# Single-blog prompt, filled in with %-substitution
+_PROMPT_TMPL = """You are a helpful AI assistant. Follow these instructions exactly:
     
-    1.Generate a 200-300 word informative blog post on the following topic for a {expertise_level.lower()} audience.
+    1.Generate a 200-300 word informative blog post on the following topic for a %s audience.
+    2.Write exactly 250 words.
     3.Do NOT add any comments, disclaimers, or follow-up dialogue. Always return the blog content as plain text.
 
-    Topic: {blogtopic}
-    Expertise Level: {expertise_level}
-    Additional Context: {additional_context}
+    Topic: %s
+    Expertise Level: %s
+    Additional Context: %s
     """
-    
-    body = {
-        "prompt": full_prompt,
-        "max_gen_len": 512,
-        "temperature": 0.5,
-        "top_p": 0.9
-    }
 
+# A 250-word blog is ~330 Llama 3 tokens; 400 leaves headroom without
+# letting the model run long
+MAX_GEN_LEN = 400
+MIN_BLOG_WORDS = 150  # Shorter generations are re-invoked once, time permitting
+API_GATEWAY_TIMEOUT_SECONDS = 29  # Integration timeout of the REST API
+
+# Sampling parameters never change, so they are serialized once
+_BODY_TAIL = b',"temperature":0.5,"top_p":0.9}'
+
+# Batched generation: one Bedrock call covers several topics
+MAX_BATCH_SIZE = 4  # MAX_GEN_LEN tokens per blog, Llama 3 caps max_gen_len at 2048
+BATCH_INSTRUCTION = """You are a helpful AI assistant. Follow these instructions exactly:
+
+    1.For each numbered request below, generate a 200-300 word informative blog post on its topic for the stated audience. Write exactly 250 words per blog post.
+    2.Begin each blog post with its marker line exactly as given (for example ===BLOG 1===) and write nothing else before, between, or after the blog posts.
+    3.Do NOT add any comments, disclaimers, or follow-up dialogue. Always return the blog content as plain text.
+
+"""
+BLOG_MARKER = re.compile(r"^\s*===BLOG (\d+)===", re.MULTILINE)  # Text may follow on the same line
+
+# Batched blogs are uploaded in parallel on a pool that lives at module scope
+# so it survives across warm invocations. Uploads finish before the handler
+# returns: Lambda freezes the sandbox after that, stalling unfinished work.
+EXECUTOR = ThreadPoolExecutor(max_workers=MAX_BATCH_SIZE)
+BUCKET = "blogcreatorbucket"  # Replace with your actual bucket name
+PREFIX = "generated-content"
+PRESIGNED_URL_SECONDS = 7200  # Outlives the Streamlit client's 1 h result cache
+_s3_warmup = None  # Future of the one-off S3 connection warm-up
+
+# Generated blogs are optionally cached in DynamoDB (partition key 'h', TTL
+# attribute 'ttl'); the cache is off unless CACHE_TABLE names a table
+CACHE_TABLE = os.environ.get("CACHE_TABLE", "")
+CACHE_TTL_SECONDS = 86400
+# Keys are salted with the model and generation settings, so changing the
+# prompt or model retires entries cached under the old ones
+_CACHE_SALT = hashlib.blake2b(
+    f"{MODEL_ID}\x00{_PROMPT_TMPL}\x00{MAX_GEN_LEN}".encode('utf-8') + _BODY_TAIL,
+    digest_size=16
+).digest()
+
+def build_body(prompt: str, max_gen_len: int) -> bytes:
+    """Serialize a Bedrock request body around the pre-encoded static fields"""
+    return b'{"prompt":%s,"max_gen_len":%d%s' % (json_dumps(prompt), max_gen_len, _BODY_TAIL)
+
+def invoke_generation(body: bytes) -> str:
+    """
+    Invoke the Bedrock model.
+    Returns: The generated text.
+    """
+    response = BEDROCK.invoke_model(
+        body=body,
+        modelId=MODEL_ID
+    )
+
+    # The body is read once and parsed straight from bytes (orjson and json
+    # both accept them), with no separate UTF-8 decode into an interim str;
+    # closing it hands the connection back to the pool
+    with response['body'] as stream:
+        return json_loads(stream.read()).get('generation', '')
+
+def content_cache_key(blogtopic: str, expertise_level: str, additional_context: str) -> str:
+    """Content-addressed cache key for a generation request"""
+    return hashlib.blake2b(
+        f"{blogtopic}\x00{expertise_level}\x00{additional_context}".encode('utf-8'),
+        digest_size=16,
+        key=_CACHE_SALT
+    ).hexdigest()
+
+def cache_get(key: str):
+    """Return the cached blog for key, or None on a miss or cache error"""
+    if not CACHE_TABLE:
+        return None
     try:
-        logger.info(f"Invoking Bedrock model with prompt: {full_prompt}")
-        
-        bedrock = boto3.client(
-            service_name="bedrock-runtime",
-            region_name="us-east-1",
-            config=botocore.config.Config(
-                read_timeout=300,
-                retries={'max_attempts': 3}
-            )
-        )
-        
-        response = bedrock.invoke_model(
-            body=json.dumps(body),
-            modelId="us.meta.llama3-3-70b-instruct-v1:0"
-        )
-        
-        # Log the full response body to diagnose issues
-        response_body = response['body'].read().decode('utf-8')
-        logger.info(f"Bedrock response: {response_body}")
+        item = DDB.get_item(TableName=CACHE_TABLE, Key={'h': {'S': key}}).get('Item')
+        # DynamoDB deletes expired items lazily, so check the TTL ourselves
+        if item and int(item['ttl']['N']) > time.time():
+            return item['blog']['S']
+    except Exception as e:
+        logger.error(f"Cache lookup failed: {str(e)}")
+    return None
+
+def cache_put(key: str, blog: str) -> None:
+    """Store a generated blog in the cache"""
+    if not CACHE_TABLE:
+        return
+    try:
+        DDB.put_item(TableName=CACHE_TABLE, Item={
+            'h': {'S': key},
+            'blog': {'S': blog},
+            'ttl': {'N': str(int(time.time()) + CACHE_TTL_SECONDS)}
+        })
+    except Exception as e:
+        logger.error(f"Cache write failed: {str(e)}")
+
+def content_generation(blogtopic: str, expertise_level: str, additional_context: str,
+                       deadline: float = float('inf')) -> dict:
+    """
+    Generate blog content using AWS Bedrock; a retry is only started if it
+    can finish before deadline (a time.monotonic() value).
+    Returns: Plain text blog content and whether generation succeeded.
+    """
+    cache_key = content_cache_key(blogtopic, expertise_level, additional_context)
+    cached_blog = cache_get(cache_key)
+    if cached_blog:
+        return {"blog": cached_blog, "success": True}
+
+    full_prompt = _PROMPT_TMPL % (
+        expertise_level.lower(), blogtopic, expertise_level, additional_context
+    )
+    body = build_body(full_prompt, MAX_GEN_LEN)
+
+    try:
+        logger.debug("Invoking Bedrock model with prompt: %s", full_prompt)
         
-        # Try to parse the generated text
-        response_json = json.loads(response_body)
-        generated_text = response_json.get('generation', '').strip()
+        started = time.monotonic()
+        generated_text = invoke_generation(body).strip()
+        elapsed = time.monotonic() - started
+        logger.debug("Bedrock response: %s", generated_text)
+    except Exception as e:
+        logger.error(f"Bedrock invocation failed: {str(e)}")
+        return {"blog": FAILED_BLOG, "success": False}
 
-        if not generated_text:
-            logger.error("No valid content returned from the model.")
-            return {"blog": "Failed to generate content. Please try again."}
+    # Re-invoke once only when the blog is drastically short and a second call
+    # as slow as the first still fits; the first result is kept unless the
+    # retry succeeds with a longer blog
+    word_count = len(generated_text.split())
+    if word_count < MIN_BLOG_WORDS and time.monotonic() + elapsed > deadline:
+        logger.warning(f"Generated blog has only {word_count} words, no time left to retry")
+    elif word_count < MIN_BLOG_WORDS:
+        logger.warning(f"Generated blog has only {word_count} words, retrying")
+        try:
+            retry_text = invoke_generation(body).strip()
+            logger.debug("Bedrock retry response: %s", retry_text)
+            if len(retry_text.split()) > word_count:
+                generated_text = retry_text
+        except Exception as e:
+            logger.error(f"Bedrock retry failed: {str(e)}")
+
+    if not generated_text:
+        logger.error("No valid content returned from the model.")
+        return {"blog": FAILED_BLOG, "success": False}
+
+    # Only full-length blogs are cached, so one short generation isn't served
+    # for a day. The write is inline (a few ms) so it can't freeze with the
+    # sandbox and miss an immediate repeat request
+    if len(generated_text.split()) >= MIN_BLOG_WORDS:
+        cache_put(cache_key, generated_text)
+
+    return {"blog": generated_text, "success": True}  # Return only the generated text without JSON structure
+
+def batch_content_generation(items: list) -> dict:
+    """
+    Generate several blogs with a single Bedrock call.
+    Returns: {"blogs": [...]} in the same order as items, and the 1-based
+    indices of blogs that could not be generated under "failed".
+    """
+    full_prompt = BATCH_INSTRUCTION + "\n".join(
+        f"===BLOG {i}===\nTopic: {topic}\nExpertise Level: {level}\nAdditional Context: {context}\n"
+        for i, (topic, level, context) in enumerate(items, start=1)
+    )
+
+    body = build_body(full_prompt, MAX_GEN_LEN * len(items))
+
+    try:
+        logger.debug("Invoking Bedrock model with batched prompt: %s", full_prompt)
+
+        response_body = invoke_generation(body)
+        logger.debug("Bedrock response: %s", response_body)
+
+        # re.split yields [preamble, index, text, index, text, ...]
+        parts = BLOG_MARKER.split(response_body)
+        blogs = {int(index): text.strip() for index, text in zip(parts[1::2], parts[2::2])}
+
+        missing = [i for i in range(1, len(items) + 1) if not blogs.get(i)]
+        if missing:
+            logger.error(f"Batched response is missing blogs: {missing}")
+
+        return {
+            "blogs": [blogs.get(i) or FAILED_BLOG for i in range(1, len(items) + 1)],
+            "failed": missing
+        }
 
-        return {"blog": generated_text}  # Return only the generated text without JSON structure
-            
     except Exception as e:
         logger.error(f"Bedrock invocation failed: {str(e)}")
-        return {"blog": "Failed to generate content. Please try again."}
+        return {"blogs": [FAILED_BLOG] * len(items), "failed": list(range(1, len(items) + 1))}
+
+def content_key(blog_bytes: bytes, prefix: str) -> str:
+    """Content-addressed S3 key, so identical blogs map to a single object"""
+    digest = hashlib.blake2b(blog_bytes, digest_size=12).hexdigest()
+    # Use .txt extension for plain text
+    return f"{prefix}/{digest}.txt"
 
-def s3_uploader(content: dict, bucket: str, prefix: str) -> bool:
-    """Upload generated content to S3 as a plain text file"""
+def object_url(bucket: str, key: str) -> str:
+    """Presigned GET URL for an object written by s3_uploader (the bucket stays private)"""
+    # Signed locally, no S3 round trip; only handed out for stored blogs
+    return S3.generate_presigned_url(
+        'get_object',
+        Params={'Bucket': bucket, 'Key': key},
+        ExpiresIn=PRESIGNED_URL_SECONDS
+    )
+
+def put_blog(blog_bytes: bytes, bucket: str, key: str) -> bool:
+    """Write a blog to S3 as a plain text file, skipping duplicates"""
     try:
-        s3 = boto3.client('s3')
-        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        # Use .txt extension for plain text
-        key = f"{prefix}/{timestamp}.txt"
-        
-        # Extract only the blog content as plain text
-        blog_content = content.get('blog', '').strip()
-        
-        s3.put_object(
-            Body=blog_content,  # Upload the content as plain text
+        # Conditional PUT: S3 refuses the write if the object already exists
+        S3.put_object(
+            Body=blog_bytes,
             Bucket=bucket,
             Key=key,
-            ContentType='text/plain'  # Set the content type to plain text
+            ContentType='text/plain',  # Set the content type to plain text
+            IfNoneMatch='*'
         )
         return True
+    except ClientError as e:
+        # The same content is already stored (or being stored) under this key
+        if e.response['Error']['Code'] in ('PreconditionFailed', 'ConditionalRequestConflict'):
+            return True
+        logger.error(f"S3 upload failed: {str(e)}")
+        return False
     except Exception as e:
         logger.error(f"S3 upload failed: {str(e)}")
         return False
 
-def validate_input(event: dict) -> tuple:
-    """Validate and extract input parameters"""
+def s3_uploader(content: dict, bucket: str, prefix: str) -> tuple:
+    """
+    Upload generated content to S3 as a plain text file.
+    Returns: The content-addressed key and whether the blog is stored there.
+    """
+    # Extract only the blog content as plain text
+    blog_bytes = content.get('blog', '').strip().encode('utf-8')
+    key = content_key(blog_bytes, prefix)
+    return key, put_blog(blog_bytes, bucket, key)
+
+def upload_status(stored: list) -> str:
+    """Summarize upload outcomes for the response message"""
+    return "uploaded to S3" if all(stored) else "upload to S3 failed"
+
+def warm_s3_connection() -> None:
+    """Open the pooled S3 connection so the first upload skips the TLS handshake"""
+    try:
+        S3.head_bucket(Bucket=BUCKET)  # Needs s3:ListBucket on the bucket
+    except Exception as e:
+        logger.warning(f"S3 warm-up failed (check s3:ListBucket on {BUCKET}): {str(e)}")
+
+def batch_message(failed: list, total: int, status: str) -> str:
+    """Describe a batch outcome, naming the positions that failed"""
+    if not failed:
+        return f"Blog content successfully generated; {status}."
+    if len(failed) == total:
+        return "Failed to generate blog content."
+    positions = ", ".join(str(index) for index in failed)
+    return f"Failed to generate blogs at positions {positions}; the others were generated, {status}."
+
+def validate_input(event: dict) -> tuple | list:
+    """
+    Validate and extract input parameters.
+    Returns: A (topic, level, context) tuple, or a list of them when
+    the body carries a 'blogTopics' list.
+    """
     try:
-        if isinstance(event.get('body'), str):
-            body = json.loads(event['body'])
-        else:
-            body = event.get('body', {})
+        # Proxy integrations deliver a JSON string, direct invocations a dict
+        body = event.get('body') or {}
+        if isinstance(body, (str, bytes)):
+            # Set when the API's binary media types match the request
+            if event.get('isBase64Encoded'):
+                body = base64.b64decode(body, validate=True)
+            body = json_loads(body)
+        
+        if isinstance(body.get('blogTopics'), list):
+            items = []
+            for entry in body['blogTopics']:
+                if not isinstance(entry, dict):
+                    raise ValueError("Each blogTopics entry must be an object with a blogTopic")
+                topic = entry.get('blogTopic', '').strip()
+                if not topic:
+                    raise ValueError("Blog topic is required")
+                items.append((
+                    topic,
+                    entry.get('level', 'Intermediate'),
+                    entry.get('context', '')
+                ))
+            if not items:
+                raise ValueError("At least one blog topic is required")
+            if len(items) > MAX_BATCH_SIZE:
+                raise ValueError(f"At most {MAX_BATCH_SIZE} blog topics are allowed per request")
+            return items
         
         blog_topic = body.get('blogTopic', '').strip()
         if not blog_topic:
@@ -106,6 +370,8 @@ def validate_input(event: dict) -> tuple:
         )
     except json.JSONDecodeError:
         raise ValueError("Invalid JSON payload")
+    except binascii.Error:
+        raise ValueError("Invalid base64 payload")
     except Exception as e:
         raise ValueError(str(e))
 
@@ -117,44 +383,95 @@ def format_response(content: dict, status_code: int = 200) -> dict:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(content)
+        'body': json_dumps(content).decode('utf-8')
     }
 
+def request_deadline(context) -> float:
+    """Monotonic time by which generation must end to leave room for the upload"""
+    budget = API_GATEWAY_TIMEOUT_SECONDS
+    if context is not None:
+        budget = min(budget, context.get_remaining_time_in_millis() / 1000)
+    return time.monotonic() + budget - UPLOAD_BUDGET_SECONDS
+
 def lambda_handler(event, context):
+    global _s3_warmup
     try:
-        logger.info(f"Incoming event: {json.dumps(event)}")
+        # On a container's first invocation, connect to S3 while Bedrock is
+        # generating; a connection opened during INIT would sit idle until
+        # traffic arrives and be closed by S3 before the first upload
+        if _s3_warmup is None:
+            _s3_warmup = EXECUTOR.submit(warm_s3_connection)
+        
+        deadline = request_deadline(context)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Incoming event: %s", json_dumps(event).decode('utf-8'))
         
         # Validate and extract input
-        blog_topic, expertise_level, additional_context = validate_input(event)
+        parsed_input = validate_input(event)
+        
+        if isinstance(parsed_input, list):
+            generated_content = batch_content_generation(parsed_input)
+            
+            failed = generated_content["failed"]
+            
+            # Upload each generated blog to S3 in parallel; failed entries
+            # are neither uploaded nor linked
+            blogs = {
+                index: blog
+                for index, blog in enumerate(generated_content["blogs"], start=1)
+                if index not in failed
+            }
+            uploads = dict(zip(blogs, EXECUTOR.map(
+                lambda blog: s3_uploader({"blog": blog}, BUCKET, PREFIX), blogs.values()
+            )))
+            # Only stored blogs get a link
+            urls = [
+                object_url(BUCKET, uploads[index][0])
+                if index in uploads and uploads[index][1] else None
+                for index in range(1, len(generated_content["blogs"]) + 1)
+            ]
+            return format_response({
+                "blogs": generated_content["blogs"],
+                "failed": failed,
+                "success": not failed,
+                "urls": urls,
+                "message": batch_message(failed, len(urls), upload_status([stored for _, stored in uploads.values()]))
+            })
+        
+        blog_topic, expertise_level, additional_context = parsed_input
         
         # Generate content
         generated_content = content_generation(
             blogtopic=blog_topic,
             expertise_level=expertise_level,
-            additional_context=additional_context
+            additional_context=additional_context,
+            deadline=deadline
         )
         
-        logger.info(f"Generated Content: {generated_content}")
-        
-        # Upload to S3 as a .txt file
-        s3_upload_success = s3_uploader(
-            content=generated_content,
-            bucket="blogcreatorbucket",  # Replace with your actual bucket name
-            prefix="generated-content"
-        )
+        logger.debug("Generated Content: %s", generated_content)
         
-        # Return only blog content, or error if it fails
-        if s3_upload_success:
-            return format_response({
-                "blog": generated_content.get("blog", ""),
-                "message": "Blog content successfully generated and uploaded."
-            })
-        else:
+        if not generated_content["success"]:
             return format_response({
-                "blog": generated_content.get("blog", ""),
-                "message": "Failed to upload blog content to S3."
+                "blog": generated_content["blog"],
+                "success": False,
+                "message": "Failed to generate blog content."
             })
         
+        # Upload to S3 as a .txt file before responding, so the sandbox
+        # doesn't freeze mid-upload. Cache hits are uploaded too: the
+        # conditional PUT is a cheap no-op when the object exists, and it
+        # restores the object if the first upload was lost
+        key, stored = s3_uploader(generated_content, BUCKET, PREFIX)
+        
+        # Return only blog content, linked if the upload succeeded
+        return format_response({
+            "blog": generated_content["blog"],
+            "success": True,
+            "url": object_url(BUCKET, key) if stored else None,
+            "message": f"Blog content successfully generated; {upload_status([stored])}."
+        })
+        
     except ValueError as e:
         logger.error(f"Input validation error: {str(e)}")
         return format_response(
@@ -0,0 +1,43 @@
+import io
+import json
+import os
+import sys
+
+import pytest
+
+# main.py creates its AWS clients at import time; give them a region and
+# placeholder credentials (presigning needs some)
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class StubBedrock:
+    """Stands in for the bedrock-runtime client with canned generations (or errors)"""
+
+    def __init__(self, *generations, error=None):
+        self.generations = list(generations)
+        self.error = error
+        self.calls = 0
+
+    def invoke_model(self, body, modelId):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        generation = self.generations.pop(0)
+        if isinstance(generation, Exception):
+            raise generation
+        payload = json.dumps({"generation": generation}).encode("utf-8")
+        return {"body": io.BytesIO(payload)}
+
+@pytest.fixture
+def bedrock(monkeypatch):
+    """Install a StubBedrock in place of main.BEDROCK and return it"""
+    import main
+
+    def install(*generations, error=None):
+        stub = StubBedrock(*generations, error=error)
+        monkeypatch.setattr(main, "BEDROCK", stub)
+        return stub
+    return install
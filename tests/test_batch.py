@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+import main
+
+ITEMS = [
+    ("Machine Learning", "Beginner", ""),
+    ("Serverless", "Advanced", "Cold starts."),
+]
+
+def test_batch_splits_blogs_on_markers(bedrock):
+    bedrock("===BLOG 1===\nFirst blog.\n===BLOG 2===\nSecond blog.\n")
+    result = main.batch_content_generation(ITEMS)
+    assert result == {"blogs": ["First blog.", "Second blog."], "failed": []}
+
+def test_batch_accepts_inline_text_after_marker(bedrock):
+    bedrock("===BLOG 1=== First blog.\n  ===BLOG 2===Second blog.")
+    result = main.batch_content_generation(ITEMS)
+    assert result == {"blogs": ["First blog.", "Second blog."], "failed": []}
+
+def test_batch_marks_missing_index_as_failed(bedrock):
+    bedrock("===BLOG 1===\nFirst blog.")
+    result = main.batch_content_generation(ITEMS)
+    assert result == {"blogs": ["First blog.", main.FAILED_BLOG], "failed": [2]}
+
+def test_batch_ignores_out_of_range_index(bedrock):
+    bedrock("===BLOG 1===\nFirst blog.\n===BLOG 3===\nStray blog.")
+    result = main.batch_content_generation(ITEMS)
+    assert result == {"blogs": ["First blog.", main.FAILED_BLOG], "failed": [2]}
+
+def test_batch_marks_empty_blog_as_failed(bedrock):
+    bedrock("===BLOG 1===\n\n===BLOG 2===\nSecond blog.")
+    result = main.batch_content_generation(ITEMS)
+    assert result == {"blogs": [main.FAILED_BLOG, "Second blog."], "failed": [1]}
+
+def test_batch_fails_every_blog_when_bedrock_fails(bedrock):
+    bedrock(error=RuntimeError("throttled"))
+    result = main.batch_content_generation(ITEMS)
+    assert result == {"blogs": [main.FAILED_BLOG] * 2, "failed": [1, 2]}
+
+def test_validate_input_parses_blog_topics():
+    body = json.dumps({"blogTopics": [
+        {"blogTopic": " Machine Learning ", "level": "Beginner"},
+        {"blogTopic": "Serverless", "level": "Advanced", "context": "Cold starts."},
+    ]})
+    assert main.validate_input({"body": body}) == [
+        ("Machine Learning", "Beginner", ""),
+        ("Serverless", "Advanced", "Cold starts."),
+    ]
+
+def test_validate_input_rejects_non_object_entry():
+    with pytest.raises(ValueError, match="must be an object"):
+        main.validate_input({"body": {"blogTopics": ["Machine Learning"]}})
+
+def test_validate_input_rejects_entry_without_topic():
+    with pytest.raises(ValueError, match="Blog topic is required"):
+        main.validate_input({"body": {"blogTopics": [{"level": "Beginner"}]}})
+
+def test_validate_input_rejects_empty_list():
+    with pytest.raises(ValueError, match="At least one blog topic"):
+        main.validate_input({"body": {"blogTopics": []}})
+
+def test_validate_input_rejects_too_many_topics():
+    topics = [{"blogTopic": f"Topic {i}"} for i in range(main.MAX_BATCH_SIZE + 1)]
+    with pytest.raises(ValueError, match=f"At most {main.MAX_BATCH_SIZE}"):
+        main.validate_input({"body": {"blogTopics": topics}})
+
+def test_batch_message_all_succeeded():
+    message = main.batch_message([], 3, "uploaded to S3")
+    assert message == "Blog content successfully generated; uploaded to S3."
+
+def test_batch_message_all_failed():
+    assert main.batch_message([1, 2, 3], 3, "uploaded to S3") == "Failed to generate blog content."
+
+def test_batch_message_partial_failure_names_positions():
+    message = main.batch_message([1, 3], 3, "upload to S3 failed")
+    assert message == "Failed to generate blogs at positions 1, 3; the others were generated, upload to S3 failed."
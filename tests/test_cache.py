@@ -0,0 +1,72 @@
+import time
+
+import pytest
+
+import main
+
+LONG_BLOG = " ".join(["word"] * main.MIN_BLOG_WORDS)
+
+class StubDynamoDB:
+    """Stands in for the DynamoDB client with an in-memory table"""
+
+    def __init__(self):
+        self.items = {}
+        self.puts = 0
+
+    def get_item(self, TableName, Key):
+        item = self.items.get(Key["h"]["S"])
+        return {"Item": item} if item else {}
+
+    def put_item(self, TableName, Item):
+        self.puts += 1
+        self.items[Item["h"]["S"]] = Item
+
+@pytest.fixture
+def ddb(monkeypatch):
+    stub = StubDynamoDB()
+    monkeypatch.setattr(main, "DDB", stub)
+    monkeypatch.setattr(main, "CACHE_TABLE", "blog_cache")
+    return stub
+
+def test_cache_hit_skips_bedrock(bedrock, ddb):
+    stub = bedrock(LONG_BLOG)
+    first = main.content_generation("Serverless", "Beginner", "")
+    second = main.content_generation("Serverless", "Beginner", "")
+    assert first == second == {"blog": LONG_BLOG, "success": True}
+    assert stub.calls == 1 and ddb.puts == 1
+
+def test_expired_entry_is_a_miss(ddb):
+    key = main.content_cache_key("Serverless", "Beginner", "")
+    ddb.items[key] = {"h": {"S": key}, "blog": {"S": LONG_BLOG}, "ttl": {"N": str(int(time.time()) - 1)}}
+    assert main.cache_get(key) is None
+
+def test_empty_cache_table_disables_cache(bedrock, ddb, monkeypatch):
+    monkeypatch.setattr(main, "CACHE_TABLE", "")
+    stub = bedrock(LONG_BLOG, LONG_BLOG)
+    main.content_generation("Serverless", "Beginner", "")
+    main.content_generation("Serverless", "Beginner", "")
+    assert stub.calls == 2 and ddb.puts == 0
+
+def test_short_blog_kept_past_deadline_is_not_cached(bedrock, ddb):
+    bedrock("Too short.")
+    result = main.content_generation("Serverless", "Beginner", "", deadline=time.monotonic())
+    assert result == {"blog": "Too short.", "success": True}
+    assert ddb.puts == 0
+
+def test_short_blog_kept_after_shorter_retry_is_not_cached(bedrock, ddb):
+    bedrock("Too short.", "Short.")
+    result = main.content_generation("Serverless", "Beginner", "")
+    assert result == {"blog": "Too short.", "success": True}
+    assert ddb.puts == 0
+
+def test_short_blog_kept_after_failed_retry_is_not_cached(bedrock, ddb):
+    bedrock("Too short.", RuntimeError("throttled"))
+    result = main.content_generation("Serverless", "Beginner", "")
+    assert result == {"blog": "Too short.", "success": True}
+    assert ddb.puts == 0
+
+def test_failed_generation_is_not_cached(bedrock, ddb):
+    bedrock(error=RuntimeError("throttled"))
+    result = main.content_generation("Serverless", "Beginner", "")
+    assert result == {"blog": main.FAILED_BLOG, "success": False}
+    assert ddb.puts == 0
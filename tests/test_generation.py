@@ -0,0 +1,25 @@
+import time
+
+import main
+
+LONG_BLOG = " ".join(["word"] * main.MIN_BLOG_WORDS)
+
+def test_short_blog_is_retried_when_time_allows(bedrock):
+    stub = bedrock("Too short.", LONG_BLOG)
+    result = main.content_generation("Serverless", "Beginner", "")
+    assert result == {"blog": LONG_BLOG, "success": True}
+    assert stub.calls == 2
+
+def test_short_blog_is_kept_without_retry_past_deadline(bedrock):
+    stub = bedrock("Too short.", LONG_BLOG)
+    result = main.content_generation("Serverless", "Beginner", "", deadline=time.monotonic())
+    assert result == {"blog": "Too short.", "success": True}
+    assert stub.calls == 1
+
+def test_request_deadline_respects_remaining_lambda_time():
+    class Context:
+        def get_remaining_time_in_millis(self):
+            return 10_000
+
+    budget = main.request_deadline(Context()) - time.monotonic()
+    assert budget <= 10 - main.UPLOAD_BUDGET_SECONDS
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+import main
+
+LONG_BLOG = " ".join(["word"] * main.MIN_BLOG_WORDS)
+
+@pytest.fixture(autouse=True)
+def no_s3_warmup(monkeypatch):
+    monkeypatch.setattr(main, "warm_s3_connection", lambda: None)
+
+def invoke(body):
+    response = main.lambda_handler({"body": json.dumps(body)}, None)
+    return json.loads(response["body"])
+
+def test_stored_blog_is_linked(bedrock, monkeypatch):
+    bedrock(LONG_BLOG)
+    monkeypatch.setattr(main, "put_blog", lambda blog_bytes, bucket, key: True)
+    content = invoke({"blogTopic": "Serverless"})
+    assert content["success"] and content["url"]
+    assert content["message"] == "Blog content successfully generated; uploaded to S3."
+
+def test_failed_upload_is_not_linked(bedrock, monkeypatch):
+    bedrock(LONG_BLOG)
+    monkeypatch.setattr(main, "put_blog", lambda blog_bytes, bucket, key: False)
+    content = invoke({"blogTopic": "Serverless"})
+    assert content["success"] and content["url"] is None
+    assert content["message"] == "Blog content successfully generated; upload to S3 failed."
+
+def test_batch_links_only_stored_blogs(bedrock, monkeypatch):
+    bedrock("===BLOG 1===\nFirst blog.\n===BLOG 2===\nSecond blog.")
+    monkeypatch.setattr(main, "put_blog", lambda blog_bytes, bucket, key: blog_bytes == b"First blog.")
+    content = invoke({"blogTopics": [{"blogTopic": "Machine Learning"}, {"blogTopic": "Serverless"}]})
+    assert content["urls"][0] and content["urls"][1] is None
+    assert content["failed"] == []
@@ -0,0 +1,47 @@
+import pytest
+from botocore.stub import Stubber
+
+import main
+
+BLOG = b"A blog about serverless."
+KEY = main.content_key(BLOG, main.PREFIX)
+
+@pytest.fixture
+def s3():
+    with Stubber(main.S3) as stubber:
+        yield stubber
+        stubber.assert_no_pending_responses()
+
+def expected_put():
+    return {
+        "Body": BLOG,
+        "Bucket": main.BUCKET,
+        "Key": KEY,
+        "ContentType": "text/plain",
+        "IfNoneMatch": "*",
+    }
+
+def test_content_key_is_stable_for_identical_bytes():
+    assert main.content_key(BLOG, main.PREFIX) == KEY
+    assert main.content_key(b"Another blog.", main.PREFIX) != KEY
+    assert KEY.startswith(f"{main.PREFIX}/") and KEY.endswith(".txt")
+
+def test_put_blog_is_conditional(s3):
+    s3.add_response("put_object", {}, expected_put())
+    assert main.put_blog(BLOG, main.BUCKET, KEY) is True
+
+@pytest.mark.parametrize("code, status", [
+    ("PreconditionFailed", 412),
+    ("ConditionalRequestConflict", 409),
+])
+def test_put_blog_treats_existing_object_as_stored(s3, code, status):
+    s3.add_client_error("put_object", code, http_status_code=status, expected_params=expected_put())
+    assert main.put_blog(BLOG, main.BUCKET, KEY) is True
+
+def test_put_blog_reports_other_errors(s3):
+    s3.add_client_error("put_object", "AccessDenied", http_status_code=403, expected_params=expected_put())
+    assert main.put_blog(BLOG, main.BUCKET, KEY) is False
+
+def test_upload_status_reports_any_failure():
+    assert main.upload_status([True, True]) == "uploaded to S3"
+    assert main.upload_status([True, False]) == "upload to S3 failed"